@@ -162,6 +162,11 @@ def base_notebooker(
     help="This mode disables the ability to execute notebooks via REST or the webapp front-end. "
     "Useful if you only want to display results which were e.g. executed by an external application.",
 )
+@click.option(
+    "--report-submission-workers",
+    default=8,
+    help="The number of threads which launch the subprocesses of reports submitted via the webapp.",
+)
 @pass_config
 def start_webapp(
     config: BaseConfig,
@@ -173,6 +178,7 @@ def start_webapp(
     scheduler_mongo_database,
     scheduler_mongo_collection,
     readonly_mode,
+    report_submission_workers,
 ):
     web_config = WebappConfig.copy_existing(config)
     web_config.PORT = port
@@ -183,6 +189,7 @@ def start_webapp(
     web_config.SCHEDULER_MONGO_DATABASE = scheduler_mongo_database
     web_config.SCHEDULER_MONGO_COLLECTION = scheduler_mongo_collection
     web_config.READONLY_MODE = readonly_mode
+    web_config.REPORT_SUBMISSION_WORKERS = report_submission_workers
     return main(web_config)
 
 
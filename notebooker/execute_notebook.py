@@ -487,6 +487,52 @@ def _monitor_stderr(process, job_id, serializer_cls, serializer_args):
     return "".join(stderr)
 
 
+def save_submitted_report_stub(
+    base_config,
+    report_name,
+    report_title,
+    mailto,
+    error_mailto,
+    overrides,
+    *,
+    hide_code=False,
+    generate_pdf_output=False,
+    scheduler_job_id=None,
+    mailfrom=None,
+    email_subject=None,
+    is_slideshow=False,
+    category=None,
+) -> str:
+    """
+    Saves a "submitted" stub for a new report run into storage, so that its status can be polled before the
+    report subprocess has started. The parameters are as per run_report_in_subprocess().
+    :return: The unique job_id, which should be passed on to run_report_in_subprocess().
+    """
+    if error_mailto is None:
+        error_mailto = ""
+    job_id = str(uuid.uuid4())
+    job_start_time = datetime.datetime.now()
+    result_serializer = initialize_serializer_from_config(base_config)
+    result_serializer.save_check_stub(
+        job_id,
+        report_name,
+        report_title=report_title,
+        job_start_time=job_start_time,
+        status=JobStatus.SUBMITTED,
+        overrides=overrides,
+        mailto=mailto,
+        error_mailto=error_mailto,
+        generate_pdf_output=generate_pdf_output,
+        hide_code=hide_code,
+        scheduler_job_id=scheduler_job_id,
+        is_slideshow=is_slideshow,
+        email_subject=email_subject,
+        mailfrom=mailfrom,
+        category=category,
+    )
+    return job_id
+
+
 def run_report_in_subprocess(
     base_config,
     report_name,
@@ -505,6 +551,7 @@ def run_report_in_subprocess(
     n_retries=3,
     is_slideshow=False,
     category=None,
+    job_id=None,
 ) -> str:
     """
     Execute the Notebooker report in a subprocess.
@@ -524,30 +571,28 @@ def run_report_in_subprocess(
     :param n_retries: The number of retries to attempt.
     :param is_slideshow: Whether the notebook is a reveal.js slideshow or not.
     :param category: Category of the notebook
+    :param job_id: `Optional[str]` The job_id of a stub already saved by save_submitted_report_stub(), if any.
     :return: The unique job_id.
     """
     if error_mailto is None:
         error_mailto = ""
-    job_id = str(uuid.uuid4())
-    job_start_time = datetime.datetime.now()
+    if job_id is None:
+        job_id = save_submitted_report_stub(
+            base_config,
+            report_name,
+            report_title,
+            mailto,
+            error_mailto,
+            overrides,
+            hide_code=hide_code,
+            generate_pdf_output=generate_pdf_output,
+            scheduler_job_id=scheduler_job_id,
+            mailfrom=mailfrom,
+            email_subject=email_subject,
+            is_slideshow=is_slideshow,
+            category=category,
+        )
     result_serializer = initialize_serializer_from_config(base_config)
-    result_serializer.save_check_stub(
-        job_id,
-        report_name,
-        report_title=report_title,
-        job_start_time=job_start_time,
-        status=JobStatus.SUBMITTED,
-        overrides=overrides,
-        mailto=mailto,
-        error_mailto=error_mailto,
-        generate_pdf_output=generate_pdf_output,
-        hide_code=hide_code,
-        scheduler_job_id=scheduler_job_id,
-        is_slideshow=is_slideshow,
-        email_subject=email_subject,
-        mailfrom=mailfrom,
-        category=category,
-    )
 
     command = (
         [
@@ -65,3 +65,5 @@ class WebappConfig(BaseConfig):
     SCHEDULER_MONGO_COLLECTION: str = ""
     DISABLE_SCHEDULER: bool = False
     READONLY_MODE: bool = False
+    # The number of threads which launch report subprocesses, so that submissions do not tie up request workers.
+    REPORT_SUBMISSION_WORKERS: int = 8
@@ -1,6 +1,7 @@
 import os
+import time
 import uuid
-from typing import Any, AnyStr, Dict, Optional
+from typing import Any, AnyStr, Dict, Optional, Tuple
 
 import git
 import jupytext
@@ -14,18 +15,39 @@ from traitlets.config import Config
 
 from notebooker.constants import TEMPLATE_DIR_SEPARATOR, kernel_spec
 from notebooker.utils.filesystem import mkdir_p
+from notebooker.utils.json_parsing import json_loads
 from notebooker.utils.notebook_execution import logger
 
+# How long we trust the latest sha of the templates repo before fetching from git again.
+GIT_SHA_CACHE_SECONDS = 5
+_git_sha_cache: Dict[str, Tuple[float, str]] = {}
+
 
 def get_resources_dir(job_id):
     return "{}/resources".format(job_id)
 
 
+def _notebook_node_from_json(raw: AnyStr) -> nbformat.NotebookNode:
+    """
+    Equivalent to nbformat.reads(raw, as_version=4), but the JSON is parsed with json_loads (i.e. orjson, if installed).
+    Notebooks saved in an older nbformat are handed to nbformat itself so that they are upgraded as before.
+    """
+    nb_dict = json_loads(raw)
+    if nb_dict.get("nbformat") != nbformat.v4.nbformat:
+        return nbformat.reads(raw, as_version=nbformat.v4.nbformat)
+    nb = nbformat.convert(nbformat.v4.to_notebook_json(nb_dict), nbformat.v4.nbformat)
+    try:
+        nbformat.validate(nb)
+    except nbformat.ValidationError as e:
+        logger.error("Notebook JSON is invalid: %s", e)
+    return nb
+
+
 def ipython_to_html(
     ipynb_path: str, job_id: str, hide_code: bool = False, is_slideshow: bool = False
 ) -> (nbformat.NotebookNode, Dict[str, Any]):
-    with open(ipynb_path, "r") as nb_file:
-        nb = nbformat.reads(nb_file.read(), as_version=nbformat.v4.nbformat)
+    with open(ipynb_path, "rb") as nb_file:
+        nb = _notebook_node_from_json(nb_file.read())
     c = Config()
     if is_slideshow:
         c.TagRemovePreprocessor.remove_cell_tags = ("injected-parameters", "parameters")
@@ -124,6 +146,34 @@ def _get_output_path_hex(notebooker_disable_git, py_template_dir) -> str:
         return str(uuid.uuid4())
 
 
+def _get_latest_sha(py_template_dir: str) -> str:
+    """
+    As _get_output_path_hex(), which fetches and pulls any new commits to the templates repo, but we only ask git
+    once every GIT_SHA_CACHE_SECONDS.
+    """
+    now = time.monotonic()
+    cached = _git_sha_cache.get(py_template_dir)
+    if cached and now - cached[0] < GIT_SHA_CACHE_SECONDS:
+        return cached[1]
+    sha = _get_output_path_hex(False, py_template_dir)
+    _git_sha_cache[py_template_dir] = (now, sha)
+    return sha
+
+
+def get_template_version(report_name: str, notebooker_disable_git: bool, py_template_dir: str) -> str:
+    """
+    Returns a key which changes whenever the template behind report_name may have changed. When using git, this is
+    the sha of the templates repo after pulling the latest changes, otherwise the modification time of the raw
+    template file.
+
+    :raises FileNotFoundError: If we are not using git and the template does not exist.
+    """
+    if py_template_dir and not notebooker_disable_git:
+        return _get_latest_sha(py_template_dir)
+    template_path = _get_template_path(convert_report_name_into_path(report_name), False, py_template_dir)
+    return str(os.stat(template_path).st_mtime_ns)
+
+
 def convert_report_name_into_path(report_name: str) -> str:
     """This reverses convert_report_path_into_name() so that we can find the templates within notebooker_templates/"""
     return report_name.replace(TEMPLATE_DIR_SEPARATOR, os.path.sep)
@@ -134,6 +184,43 @@ def convert_report_path_into_name(report_path: str) -> str:
     return report_path.replace(os.path.sep, TEMPLATE_DIR_SEPARATOR)
 
 
+def _generate_ipynb_from_py(
+    template_base_dir: str,
+    report_name: str,
+    notebooker_disable_git: bool,
+    py_template_dir: str,
+    warn_on_local: Optional[bool] = True,
+) -> Tuple[str, Optional[str]]:
+    """As generate_ipynb_from_py(), but also returns the .ipynb JSON if we have just written it, otherwise None."""
+    report_path = convert_report_name_into_path(report_name)
+    template_path = _get_template_path(report_path, warn_on_local, py_template_dir)
+    output_template_path = _ipynb_output_path(
+        template_base_dir, report_path, _get_output_path_hex(notebooker_disable_git, py_template_dir)
+    )
+
+    mkdir_p(os.path.dirname(output_template_path))
+
+    try:
+        if os.stat(output_template_path).st_size:
+            print("Loading ipynb from cached location: %s", output_template_path)
+            return output_template_path, None
+    except IOError:
+        pass
+
+    # "touch" the output file
+    print("Writing ipynb to: %s", output_template_path)
+    with open(output_template_path, "w"):
+        os.utime(output_template_path, None)
+
+    jupytext_nb = jupytext.read(template_path)
+    jupytext_nb["metadata"]["kernelspec"] = kernel_spec()  # Override the kernel spec since we want to run it..
+    ipynb_json = jupytext.writes(jupytext_nb, fmt="ipynb")
+    with open(output_template_path, "w", encoding="utf-8") as f:
+        f.write(ipynb_json if ipynb_json.endswith("\n") else ipynb_json + "\n")
+
+    return output_template_path, ipynb_json
+
+
 def generate_ipynb_from_py(
     template_base_dir: str,
     report_name: str,
@@ -157,32 +244,30 @@ def generate_ipynb_from_py(
 
     :return: The filepath of the .ipynb which we have just converted.
     """
-    report_path = convert_report_name_into_path(report_name)
-    template_path = _get_template_path(report_path, warn_on_local, py_template_dir)
-    output_template_path = _ipynb_output_path(
-        template_base_dir, report_path, _get_output_path_hex(notebooker_disable_git, py_template_dir)
+    path, _ = _generate_ipynb_from_py(
+        template_base_dir, report_name, notebooker_disable_git, py_template_dir, warn_on_local=warn_on_local
     )
+    return path
 
-    mkdir_p(os.path.dirname(output_template_path))
-
-    try:
-        with open(output_template_path, "r") as f:
-            if f.read():
-                print("Loading ipynb from cached location: %s", output_template_path)
-                return output_template_path
-    except IOError:
-        pass
-
-    # "touch" the output file
-    print("Writing ipynb to: %s", output_template_path)
-    with open(output_template_path, "w"):
-        os.utime(output_template_path, None)
-
-    jupytext_nb = jupytext.read(template_path)
-    jupytext_nb["metadata"]["kernelspec"] = kernel_spec()  # Override the kernel spec since we want to run it..
-    jupytext.write(jupytext_nb, output_template_path)
 
-    return output_template_path
+def generate_notebook_node_from_py(
+    template_base_dir: str,
+    report_name: str,
+    notebooker_disable_git: bool,
+    py_template_dir: str,
+    warn_on_local: Optional[bool] = True,
+) -> nbformat.NotebookNode:
+    """
+    As generate_ipynb_from_py(), but returns the converted notebook rather than its filepath. A freshly converted
+    notebook is parsed from memory rather than read back from disk.
+    """
+    path, ipynb_json = _generate_ipynb_from_py(
+        template_base_dir, report_name, notebooker_disable_git, py_template_dir, warn_on_local=warn_on_local
+    )
+    if ipynb_json is None:
+        with open(path, "rb") as f:
+            ipynb_json = f.read()
+    return _notebook_node_from_json(ipynb_json)
 
 
 def generate_py_from_ipynb(ipynb_path, output_dir="."):
@@ -0,0 +1,29 @@
+import json
+import re
+from typing import Any, AnyStr
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson parses integers which do not fit in 64 bits as (lossy) floats, so we leave any input which might contain
+# one of those to the standard library.
+_LONG_DIGIT_RUN = re.compile("[0-9]{19}")
+_LONG_DIGIT_RUN_BYTES = re.compile(b"[0-9]{19}")
+
+
+def json_loads(s: AnyStr) -> Any:
+    """
+    Parses JSON with orjson if it is installed (pip install notebooker[orjson]), otherwise with the standard library.
+    We fall back to the standard library for input which orjson rejects but json accepts (e.g. NaN), and for input
+    containing very large integers, which orjson would not parse exactly.
+    """
+    if orjson is not None:
+        long_digit_run = _LONG_DIGIT_RUN_BYTES if isinstance(s, (bytes, bytearray)) else _LONG_DIGIT_RUN
+        if not long_digit_run.search(s):
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                pass
+    return json.loads(s)
@@ -110,6 +110,13 @@ def get_all_result_keys(
     return all_keys
 
 
+def invalidate_result_keys_for_job(job_id: str, limit: int = 0) -> None:
+    """Drops a single job from the cached result keys, rather than reloading all of them from the serializer."""
+    all_keys = get_cache(("all_result_keys", limit))
+    if all_keys:
+        set_cache(("all_result_keys", limit), [key for key in all_keys if key[1] != job_id], timeout=1)
+
+
 def get_all_available_results_json(
     serializer: MongoResultSerializer, limit: int, report_name: str = None, readonly_mode: bool = False
 ) -> List[constants.NotebookResultBase]:
@@ -7,7 +7,7 @@ from nbconvert import HTMLExporter
 from traitlets.config import Config
 
 from notebooker.utils.caching import get_cache, set_cache
-from notebooker.utils.conversion import generate_ipynb_from_py
+from notebooker.utils.conversion import generate_notebook_node_from_py
 from notebooker.utils.filesystem import get_template_dir
 
 logger = getLogger(__name__)
@@ -50,11 +50,9 @@ def _get_parameters_cell_idx(notebook: nbformat.NotebookNode) -> Optional[int]:
 def template_name_to_notebook_node(
     template_name: str, notebooker_disable_git: bool, py_template_dir: str, warn_on_local: Optional[bool] = True
 ) -> nbformat.NotebookNode:
-    path = generate_ipynb_from_py(
+    return generate_notebook_node_from_py(
         get_template_dir(), template_name, notebooker_disable_git, py_template_dir, warn_on_local=warn_on_local
     )
-    nb = nbformat.read(path, as_version=nbformat.v4.nbformat)
-    return nb
 
 
 def _get_preview(
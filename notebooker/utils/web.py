@@ -1,6 +1,7 @@
+import functools
 import json
 import os
-from typing import AnyStr, List, Optional
+from typing import AnyStr, List, Optional, Tuple
 
 from notebooker.constants import EMAIL_SPACE_ERR_MSG, FORBIDDEN_CHAR_ERR_MSG, FORBIDDEN_INPUT_CHARS
 
@@ -35,17 +36,35 @@ def json_to_python(json_candidate: AnyStr) -> Optional[AnyStr]:
     return "\n".join(out_s)
 
 
-def validate_mailto(mailto: AnyStr, issues: List[AnyStr]) -> AnyStr:
+# The same addresses and titles are validated over and over (e.g. by scheduled runs), so the pure validation
+# results are memoised. These must never mutate anything; the public wrappers add the issues to the caller's list.
+@functools.lru_cache(maxsize=1024)
+def _validate_mailto(mailto: AnyStr) -> Tuple[AnyStr, Tuple[AnyStr, ...]]:
+    issues = []
     if not mailto:
-        return ""
+        return "", ()
     mailto = mailto.strip()
     if any(c.isspace() for c in mailto):
         issues.append(EMAIL_SPACE_ERR_MSG)
     _check_bad_chars(mailto, issues)
-    return mailto
+    return mailto, tuple(issues)
 
 
-def validate_title(title: AnyStr, issues: List[AnyStr]) -> AnyStr:
+@functools.lru_cache(maxsize=1024)
+def _validate_title(title: AnyStr) -> Tuple[AnyStr, Tuple[AnyStr, ...]]:
+    issues = []
     out_s = title.strip()
     _check_bad_chars(out_s, issues)
+    return out_s, tuple(issues)
+
+
+def validate_mailto(mailto: AnyStr, issues: List[AnyStr]) -> AnyStr:
+    mailto, mailto_issues = _validate_mailto(mailto)
+    issues.extend(mailto_issues)
+    return mailto
+
+
+def validate_title(title: AnyStr, issues: List[AnyStr]) -> AnyStr:
+    out_s, title_issues = _validate_title(title)
+    issues.extend(title_issues)
     return out_s
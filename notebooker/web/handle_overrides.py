@@ -15,6 +15,28 @@ import click
 logger = getLogger(__name__)
 
 
+def _json_serialisation_issues(overrides: Dict[AnyStr, Any]) -> List[AnyStr]:
+    """
+    Checks that the overrides can be JSON serialised, which papermill requires. The whole dict is serialised
+    in one pass; only if that fails do we check each value individually to report which ones are the problem.
+    """
+    try:
+        json.dumps(overrides)
+        return []
+    except TypeError:
+        pass
+    issues = []
+    for target, value in overrides.items():
+        try:
+            json.dumps(value)
+        except TypeError as te:
+            issues.append(
+                'Could not JSON serialise a parameter ("{}") - this must be serialisable so that '
+                "we can execute the notebook with it! (Error: {}, Value: {})".format(target, str(te), value)
+            )
+    return issues
+
+
 def _handle_overrides_safe(
     raw_python: AnyStr, output_path: AnyStr
 ) -> Dict[AnyStr, Union[Dict[AnyStr, Any], List[AnyStr]]]:
@@ -32,30 +54,23 @@ def _handle_overrides_safe(
     try:
         # Parse the python input as a Abstract Syntax Tree (this is what python itself does)
         parsed_module = ast.parse(raw_python)
-        # Figure out what each node of the tree is doing (i.e. assigning, expression, etc)
-        nodes = ast.iter_child_nodes(parsed_module)
         # Execute the code blindly. We trust the users (just about...) and are doing this in a safe-ish environment.
-        exec(compile(parsed_module, filename="<ast>", mode="exec"))
+        # Assignments land in their own namespace rather than in this function's locals().
+        namespace = {}
+        exec(compile(parsed_module, filename="<ast>", mode="exec"), globals(), namespace)
 
-        # Now, iterate through the nodes, figure out what was assigned, and add it to the 'overrides' dict.
-        for node in nodes:
+        # Now, walk the top-level statements, figure out what was assigned, and add it to the 'overrides' dict.
+        for node in parsed_module.body:
             if isinstance(node, ast.Assign):
                 targets = [_.id for _ in node.targets]
                 logger.info("Found an assignment to: {}".format(", ".join(targets)))
                 for target in targets:
-                    value = locals()[target]
-                    result["overrides"][target] = value
-                    try:
-                        json.dumps(result["overrides"])  # Test that we can JSON serialise this - required by papermill
-                    except TypeError as te:
-                        issues.append(
-                            'Could not JSON serialise a parameter ("{}") - this must be serialisable so that '
-                            "we can execute the notebook with it! (Error: {}, Value: {})".format(target, str(te), value)
-                        )
+                    result["overrides"][target] = namespace[target]
             elif isinstance(node, ast.Expr):
                 issues.append(
                     "Found an expression that did nothing! It has a value of type: {}".format(type(node.value))
                 )
+        issues.extend(_json_serialisation_issues(result["overrides"]))
     except Exception as e:
         issues.append("An error was encountered: {}".format(str(e)))
 
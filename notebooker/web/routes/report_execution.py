@@ -1,24 +1,27 @@
 from __future__ import unicode_literals
 
-import json
+import functools
+import re
 
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from logging import getLogger
 from typing import Any, Dict, List, Tuple, NamedTuple, Optional, AnyStr
 
-import nbformat
-from flask import Blueprint, abort, jsonify, render_template, request, url_for, current_app
+from flask import Blueprint, Response, abort, jsonify, render_template, request, url_for, current_app
 from nbformat import NotebookNode
 
-from notebooker.constants import DEFAULT_RESULT_LIMIT
-from notebooker.execute_notebook import run_report_in_subprocess
+from notebooker.constants import DEFAULT_RESULT_LIMIT, JobStatus
+from notebooker.execute_notebook import run_report_in_subprocess, save_submitted_report_stub
+from notebooker.serialization.serialization import initialize_serializer_from_config
 from notebooker.settings import WebappConfig
-from notebooker.utils.conversion import generate_ipynb_from_py
-from notebooker.utils.results import get_all_result_keys
+from notebooker.utils.conversion import generate_notebook_node_from_py, get_template_version
+from notebooker.utils.json_parsing import json_loads
+from notebooker.utils.results import invalidate_result_keys_for_job
 from notebooker.utils.templates import _get_parameters_cell_idx, _get_preview
 from notebooker.utils.web import convert_report_name_url_to_path, json_to_python, validate_mailto, validate_title
 from notebooker.web.handle_overrides import handle_overrides
-from notebooker.web.utils import get_serializer, _get_python_template_dir, get_all_possible_templates
+from notebooker.web.utils import _get_python_template_dir, get_serializer, get_all_possible_templates, get_webapp_config
 
 try:
     FileNotFoundError
@@ -28,6 +31,13 @@ except NameError:
 run_report_bp = Blueprint("run_report_bp", __name__)
 logger = getLogger(__name__)
 
+# Job IDs are UUIDs, which never need escaping in JSON, so we can build these response bodies without json.dumps.
+UUID_REGEX = re.compile("[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+DELETE_OK_RESPONSE = b'{"status":"ok"}'
+
+# "on" comes from HTML, "True" comes from urlencoded JSON params
+TRUTHY_PARAM_VALUES = frozenset(("on", "True", True))
+
 
 @run_report_bp.route("/run_report/get_preview/<path:report_name>", methods=["GET"])
 def run_report_get_preview(report_name):
@@ -39,30 +49,44 @@ def run_report_get_preview(report_name):
 
     :returns: An HTML rendering of a notebook template which has been converted from .py -> .ipynb -> .html
     """
+    # Handle the case where a rendered ipynb asks for "custom.css". A 404 lets the browser cache the miss.
+    if report_name.endswith(".css"):
+        return "", 404
     report_name = convert_report_name_url_to_path(report_name)
-    # Handle the case where a rendered ipynb asks for "custom.css"
-    if ".css" in report_name:
-        return ""
     return _get_preview(
         report_name,
-        notebooker_disable_git=current_app.config["NOTEBOOKER_DISABLE_GIT"],
+        notebooker_disable_git=get_webapp_config().NOTEBOOKER_DISABLE_GIT,
         py_template_dir=_get_python_template_dir(),
     )
 
 
+@functools.lru_cache(maxsize=128)
+def _load_nb_cached(
+    template_dir: str,
+    relative_report_path: str,
+    template_version: str,
+    notebooker_disable_git: bool,
+    py_template_dir: str,
+) -> NotebookNode:
+    # template_version is only part of the cache key, so that we reconvert the template once it has changed.
+    # The returned notebook is shared between requests, so callers must not mutate it.
+    return generate_notebook_node_from_py(template_dir, relative_report_path, notebooker_disable_git, py_template_dir)
+
+
 def get_report_as_nb(relative_report_path: str) -> NotebookNode:
-    path = generate_ipynb_from_py(
-        current_app.config["TEMPLATE_DIR"],
+    app_config = get_webapp_config()
+    py_template_dir = _get_python_template_dir()
+    template_version = get_template_version(relative_report_path, app_config.NOTEBOOKER_DISABLE_GIT, py_template_dir)
+    return _load_nb_cached(
+        app_config.TEMPLATE_DIR,
         relative_report_path,
-        current_app.config["NOTEBOOKER_DISABLE_GIT"],
-        _get_python_template_dir(),
+        template_version,
+        app_config.NOTEBOOKER_DISABLE_GIT,
+        py_template_dir,
     )
-    nb = nbformat.read(path, as_version=nbformat.v4.nbformat)
-    return nb
 
 
-def get_report_parameters_html(relative_report_path: str) -> str:
-    nb = get_report_as_nb(relative_report_path)
+def _extract_parameters_html(nb: NotebookNode) -> str:
     metadata_idx = _get_parameters_cell_idx(nb)
     parameters_as_html = ""
     if metadata_idx is not None:
@@ -71,6 +95,10 @@ def get_report_parameters_html(relative_report_path: str) -> str:
     return parameters_as_html
 
 
+def get_report_parameters_html(relative_report_path: str) -> str:
+    return _extract_parameters_html(get_report_as_nb(relative_report_path))
+
+
 @run_report_bp.route("/run_report/<path:report_name>", methods=["GET"])
 def run_report_http(report_name):
     """
@@ -86,6 +114,7 @@ def run_report_http(report_name):
     else:
         category = ""
     report_name = convert_report_name_url_to_path(report_name)
+    app_config = get_webapp_config()
     json_params = request.args.get("json_params")
     initial_python_parameters = json_to_python(json_params) or ""
     try:
@@ -102,16 +131,16 @@ def run_report_http(report_name):
             category=category,
             all_reports=get_all_possible_templates(),
             initialPythonParameters={},
-            readonly_mode=current_app.config["READONLY_MODE"],
-            scheduler_disabled=current_app.config["DISABLE_SCHEDULER"],
+            readonly_mode=app_config.READONLY_MODE,
+            scheduler_disabled=app_config.DISABLE_SCHEDULER,
         )
     metadata_idx = _get_parameters_cell_idx(nb)
     has_prefix = has_suffix = False
     if metadata_idx is not None:
-        has_prefix, has_suffix = (bool(nb["cells"][:metadata_idx]), bool(nb["cells"][metadata_idx + 1 :]))
+        has_prefix, has_suffix = metadata_idx > 0, metadata_idx + 1 < len(nb["cells"])
     return render_template(
         "run_report.html",
-        parameters_as_html=get_report_parameters_html(report_name),
+        parameters_as_html=_extract_parameters_html(nb),
         report_found=True,
         has_prefix=has_prefix,
         has_suffix=has_suffix,
@@ -119,9 +148,9 @@ def run_report_http(report_name):
         category=category,
         all_reports=get_all_possible_templates(),
         initialPythonParameters=initial_python_parameters,
-        default_mailfrom=current_app.config["DEFAULT_MAILFROM"],
-        readonly_mode=current_app.config["READONLY_MODE"],
-        scheduler_disabled=current_app.config["DISABLE_SCHEDULER"],
+        default_mailfrom=app_config.DEFAULT_MAILFROM,
+        readonly_mode=app_config.READONLY_MODE,
+        scheduler_disabled=app_config.DISABLE_SCHEDULER,
     )
 
 
@@ -139,7 +168,7 @@ class RunReportParams(NamedTuple):
 
 
 def validate_run_params(report_name, params, issues: List[str]) -> RunReportParams:
-    logger.info(f"Validating input params: {params} for {report_name}")
+    logger.info("Validating input params: %s for %s", params, report_name)
     # Find and cleanse the title of the report
     category = params.get("category", "")
     report_title = validate_title(
@@ -151,10 +180,9 @@ def validate_run_params(report_name, params, issues: List[str]) -> RunReportPara
     mailto = validate_mailto(params.get("mailto"), issues)
     error_mailto = validate_mailto(params.get("error_mailto"), issues)
     mailfrom = validate_mailto(params.get("mailfrom"), issues)
-    # "on" comes from HTML, "True" comes from urlencoded JSON params
-    generate_pdf_output = params.get("generate_pdf") in ("on", "True", True)
-    hide_code = params.get("hide_code") in ("on", "True", True)
-    is_slideshow = params.get("is_slideshow") in ("on", "True", True)
+    generate_pdf_output = params.get("generate_pdf") in TRUTHY_PARAM_VALUES
+    hide_code = params.get("hide_code") in TRUTHY_PARAM_VALUES
+    is_slideshow = params.get("is_slideshow") in TRUTHY_PARAM_VALUES
     email_subject = validate_title(params.get("email_subject") or "", issues)
 
     out = RunReportParams(
@@ -169,10 +197,38 @@ def validate_run_params(report_name, params, issues: List[str]) -> RunReportPara
         email_subject=email_subject,
         category=category,
     )
-    logger.info(f"Validated params: {out}")
+    logger.info("Validated params: %s", out)
     return out
 
 
+def _job_id_response(job_id: str) -> Response:
+    if not UUID_REGEX.fullmatch(job_id):
+        return jsonify({"id": job_id})
+    return Response(b'{"id":"' + job_id.encode() + b'"}', mimetype="application/json")
+
+
+def _get_report_executor() -> ThreadPoolExecutor:
+    """Report subprocesses are launched from this pool, so that submission bursts do not tie up request workers."""
+    executor = current_app.extensions.get("notebooker_report_executor")
+    if executor is None:
+        executor = ThreadPoolExecutor(
+            max_workers=get_webapp_config().REPORT_SUBMISSION_WORKERS, thread_name_prefix="report_submission"
+        )
+        current_app.extensions["notebooker_report_executor"] = executor
+    return executor
+
+
+def _run_report_in_background(base_config: WebappConfig, job_id: str, **kwargs) -> None:
+    try:
+        run_report_in_subprocess(base_config=base_config, job_id=job_id, **kwargs)
+    except Exception as e:
+        logger.exception("Report with job_id=%s failed to initialise.", job_id)
+        initialize_serializer_from_config(base_config).update_check_status(
+            job_id, JobStatus.ERROR, error_info=f"The job failed to initialise. Error: {str(e)}"
+        )
+        raise
+
+
 def _handle_run_report(
     report_name: str, overrides_dict: Dict[str, Any], issues: List[str]
 ) -> Tuple[str, int, Dict[str, str]]:
@@ -181,44 +237,52 @@ def _handle_run_report(
         return jsonify({"status": "Failed", "content": ("\n".join(issues))})
     report_name = convert_report_name_url_to_path(report_name)
     logger.info(
-        f"Handling run report with parameters report_name={report_name} "
-        f"report_title={params.report_title}"
-        f"mailto={params.mailto} "
-        f"error_mailto={params.error_mailto} "
-        f"overrides_dict={overrides_dict} "
-        f"generate_pdf_output={params.generate_pdf_output} "
-        f"hide_code={params.hide_code} "
-        f"scheduler_job_id={params.scheduler_job_id} "
-        f"mailfrom={params.mailfrom} "
-        f"email_subject={params.email_subject} "
-        f"is_slideshow={params.is_slideshow} "
-        f"category={params.category} "
+        "Handling run report with parameters report_name=%s report_title=%s mailto=%s error_mailto=%s "
+        "overrides_dict=%s generate_pdf_output=%s hide_code=%s scheduler_job_id=%s mailfrom=%s email_subject=%s "
+        "is_slideshow=%s category=%s",
+        report_name,
+        params.report_title,
+        params.mailto,
+        params.error_mailto,
+        overrides_dict,
+        params.generate_pdf_output,
+        params.hide_code,
+        params.scheduler_job_id,
+        params.mailfrom,
+        params.email_subject,
+        params.is_slideshow,
+        params.category,
+    )
+    app_config = get_webapp_config()
+    run_params = dict(
+        report_name=report_name,
+        report_title=params.report_title,
+        mailto=params.mailto,
+        error_mailto=params.error_mailto,
+        overrides=overrides_dict,
+        generate_pdf_output=params.generate_pdf_output,
+        hide_code=params.hide_code,
+        scheduler_job_id=params.scheduler_job_id,
+        mailfrom=params.mailfrom,
+        email_subject=params.email_subject,
+        is_slideshow=params.is_slideshow,
+        category=params.category,
+    )
+    # Save the stub up-front so that the job can be polled, then start the subprocess off the request thread.
+    # Failures to start the subprocess are recorded against the job, since we will usually have already responded.
+    # Callers which need to know whether the report started (e.g. the scheduler) can ask us to wait for it instead.
+    job_id = save_submitted_report_stub(app_config, **run_params)
+    submission = _get_report_executor().submit(_run_report_in_background, app_config, job_id, **run_params)
+    if request.values.get("wait_for_start") in TRUTHY_PARAM_VALUES:
+        try:
+            submission.result()
+        except RuntimeError as e:
+            return jsonify({"status": "Failed", "content": f"The job failed to initialise. Error: {str(e)}"}), 500, {}
+    return (
+        _job_id_response(job_id),
+        202,  # HTTP Accepted code
+        {"Location": url_for("pending_results_bp.task_status", report_name=report_name, job_id=job_id)},
     )
-    try:
-        with current_app.app_context():
-            app_config = WebappConfig.from_superset_kwargs(current_app.config)
-            job_id = run_report_in_subprocess(
-                base_config=app_config,
-                report_name=report_name,
-                report_title=params.report_title,
-                mailto=params.mailto,
-                error_mailto=params.error_mailto,
-                overrides=overrides_dict,
-                generate_pdf_output=params.generate_pdf_output,
-                hide_code=params.hide_code,
-                scheduler_job_id=params.scheduler_job_id,
-                mailfrom=params.mailfrom,
-                email_subject=params.email_subject,
-                is_slideshow=params.is_slideshow,
-                category=params.category,
-            )
-            return (
-                jsonify({"id": job_id}),
-                202,  # HTTP Accepted code
-                {"Location": url_for("pending_results_bp.task_status", report_name=report_name, job_id=job_id)},
-            )
-    except RuntimeError as e:
-        return jsonify({"status": "Failed", "content": f"The job failed to initialise. Error: {str(e)}"}), 500, {}
 
 
 @run_report_bp.route("/run_report_json/<path:report_name>", methods=["POST"])
@@ -233,7 +297,7 @@ def run_report_json(report_name):
     """
     issues = []
     # Get JSON overrides
-    overrides_dict = json.loads(request.values.get("overrides", "{}"))
+    overrides_dict = json_loads(request.values.get("overrides", "{}"))
     return _handle_run_report(report_name, overrides_dict, issues)
 
 
@@ -260,8 +324,7 @@ def _rerun_report(job_id, prepare_only=False, run_synchronously=False):
     prefix = "Rerun of "
     title = result.report_title if result.report_title.startswith(prefix) else (prefix + result.report_title)
 
-    with current_app.app_context():
-        app_config = WebappConfig.from_superset_kwargs(current_app.config)
+    app_config = get_webapp_config()
     new_job_id = run_report_in_subprocess(
         app_config,
         result.report_name,
@@ -310,8 +373,8 @@ def delete_report(job_id):
     """
     try:
         get_serializer().delete_result(job_id)
-        get_all_result_keys(get_serializer(), limit=DEFAULT_RESULT_LIMIT, force_reload=True)
-        return jsonify({"status": "ok"}), 200
+        invalidate_result_keys_for_job(job_id, limit=DEFAULT_RESULT_LIMIT)
+        return Response(DELETE_OK_RESPONSE, mimetype="application/json"), 200
     except Exception:
         error_info = traceback.format_exc()
         return jsonify({"status": "error", "error": error_info}), 500
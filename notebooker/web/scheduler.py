@@ -61,6 +61,8 @@ def run_report(
             "hide_code": hide_code,
             "scheduler_job_id": scheduler_job_id,
             "is_slideshow": is_slideshow,
+            # Wait for the report to start, so that we find out if it fails to.
+            "wait_for_start": True,
         }
         # This means that, if the default mailfrom changes, all already scheduled
         # jobs will use the new default in subsequent runs. Another approach could
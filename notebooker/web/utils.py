@@ -1,7 +1,8 @@
 import os
+import time
 from functools import reduce
 from logging import getLogger
-from typing import Dict, Optional, Union
+from typing import Dict, Optional, Tuple, Union
 
 from flask import g, current_app
 from werkzeug.datastructures import ImmutableMultiDict
@@ -9,10 +10,15 @@ from werkzeug.datastructures import ImmutableMultiDict
 from notebooker.constants import python_template_dir
 from notebooker.serialization.mongo import MongoResultSerializer
 from notebooker.serialization.serialization import get_serializer_from_cls
+from notebooker.settings import WebappConfig
 from notebooker.utils.templates import _valid_dirname, _valid_filename, _gen_all_templates, _extract_category
 
 logger = getLogger(__name__)
 
+# How long a scan of the template directory is reused before we walk the directory tree again.
+TEMPLATE_LISTING_CACHE_SECONDS = 30
+_template_listing_cache: Dict[Tuple[str, bool], Tuple[float, Dict, Optional[Dict]]] = {}
+
 
 def get_serializer() -> MongoResultSerializer:
     if not hasattr(g, "notebook_serializer"):
@@ -21,6 +27,15 @@ def get_serializer() -> MongoResultSerializer:
     return g.notebook_serializer
 
 
+def get_webapp_config() -> WebappConfig:
+    """The app config does not change once the app is serving requests, so we only build a WebappConfig once per app."""
+    webapp_config = current_app.extensions.get("notebooker_webapp_cfg")
+    if webapp_config is None:
+        webapp_config = WebappConfig.from_superset_kwargs(current_app.config)
+        current_app.extensions["notebooker_webapp_cfg"] = webapp_config
+    return webapp_config
+
+
 def _params_from_request_args(request_args: ImmutableMultiDict) -> Dict:
     return {k: (v[0] if len(v) == 1 else v) for k, v in request_args.lists()}
 
@@ -30,15 +45,34 @@ def _get_python_template_dir() -> str:
 
 
 def get_all_possible_templates(warn_on_local=True):
-    if _get_python_template_dir():
-        all_checks = get_directory_structure()
-    else:
+    starting_point = _get_python_template_dir()
+    if not starting_point:
         if warn_on_local:
             logger.warning("Fetching all possible checks from local repo. New updates will not be retrieved from git.")
         # Only import here because we don't actually want to import these if the app is working properly.
         from notebooker import notebook_templates_example
 
-        all_checks = get_directory_structure(os.path.abspath(notebook_templates_example.__path__[0]))
+        starting_point = os.path.abspath(notebook_templates_example.__path__[0])
+    return _get_directory_structure_cached(starting_point)
+
+
+def _get_directory_structure_cached(starting_point: str) -> Dict[str, Union[Dict, None]]:
+    """
+    Returns get_directory_structure(starting_point), reusing the result of a recent walk of the same directory.
+    The returned dictionary is shared between callers, so it must not be mutated.
+    """
+    categorization = current_app.config.get("CATEGORIZATION", False)
+    key = (starting_point, categorization)
+    now = time.monotonic()
+    cached = _template_listing_cache.get(key)
+    if cached and now - cached[0] < TEMPLATE_LISTING_CACHE_SECONDS:
+        _, all_checks, path_to_category_name = cached
+        if path_to_category_name is not None:
+            current_app.config["PATH_TO_CATEGORY_DICT"] = path_to_category_name
+        return all_checks
+    all_checks = get_directory_structure(starting_point)
+    path_to_category_name = current_app.config.get("PATH_TO_CATEGORY_DICT") if categorization else None
+    _template_listing_cache[key] = (now, all_checks, path_to_category_name)
     return all_checks
 
 
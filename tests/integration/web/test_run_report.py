@@ -32,14 +32,18 @@ def test_run_report_json_parameters(flask_app, setup_workspace):
             "mailfrom": mailfrom,
             "email_subject": email_subject,
         }
-        with mock.patch("notebooker.web.routes.report_execution.run_report_in_subprocess") as rr:
-            rr.return_value = "fake_job_id"
+        with mock.patch("notebooker.web.routes.report_execution.run_report_in_subprocess") as rr, mock.patch(
+            "notebooker.web.routes.report_execution.save_submitted_report_stub"
+        ) as stub, mock.patch("notebooker.web.routes.report_execution._get_report_executor") as executor:
+            stub.return_value = "fake_job_id"
+            executor().submit.side_effect = lambda fn, *args, **kwargs: fn(*args, **kwargs)
             rv = client.post(f"/run_report_json/{report_name}?{urllib.parse.urlencode(payload)}")
             assert rv.data == jsonify({"id": "fake_job_id"}).data
             assert rv.status_code == 202, rv.data
 
             rr.assert_called_with(
                 base_config=ANY,
+                job_id="fake_job_id",
                 report_name=report_name,
                 report_title=report_title,
                 mailto=mailto,
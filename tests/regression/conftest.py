@@ -0,0 +1,55 @@
+import os
+import shutil
+import uuid
+
+import pytest
+
+from notebooker.constants import DEFAULT_DATABASE_NAME, DEFAULT_RESULT_COLLECTION_NAME, DEFAULT_SERIALIZER
+from notebooker.settings import WebappConfig
+from notebooker.web.app import create_app, setup_app
+
+
+@pytest.fixture(scope="module")
+def regression_workspace(tmp_path_factory):
+    """One workspace per test module, shared by every parametrized template within it."""
+    workspace = tmp_path_factory.mktemp("regression")
+    yield str(workspace)
+    shutil.rmtree(str(workspace), ignore_errors=True)
+
+
+@pytest.fixture(scope="module")
+def template_dir(regression_workspace):
+    return os.path.join(regression_workspace, "templates")
+
+
+@pytest.fixture
+def output_dir(regression_workspace):
+    """Each test writes into its own subdirectory, which is removed afterwards so tests stay isolated."""
+    path = os.path.join(regression_workspace, "output", str(uuid.uuid4()))
+    os.makedirs(path)
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture(scope="module")
+def flask_app(regression_workspace, template_dir):
+    # The templates are executed directly, so the scheduler (and therefore a mongo server) is not needed here.
+    webapp_config = WebappConfig(
+        CACHE_DIR=os.path.join(regression_workspace, "cache"),
+        OUTPUT_DIR=os.path.join(regression_workspace, "output"),
+        TEMPLATE_DIR=template_dir,
+        DISABLE_SCHEDULER=True,
+        SERIALIZER_CLS=DEFAULT_SERIALIZER,
+        SERIALIZER_CONFIG={
+            "mongo_host": "localhost",
+            "database_name": DEFAULT_DATABASE_NAME,
+            "result_collection_name": DEFAULT_RESULT_COLLECTION_NAME,
+        },
+        PY_TEMPLATE_BASE_DIR=regression_workspace,
+        PY_TEMPLATE_SUBDIR="templates",
+    )
+    flask_app = create_app(webapp_config)
+    flask_app = setup_app(flask_app, webapp_config)
+    flask_app.config["DEBUG"] = True
+    flask_app.config["TESTING"] = True
+    return flask_app
@@ -3,7 +3,9 @@ from __future__ import unicode_literals
 from mock import patch
 import pytest
 
-from notebooker.execute_notebook import _get_overrides, docker_compose_entrypoint
+from notebooker.constants import DEFAULT_SERIALIZER
+from notebooker.execute_notebook import _get_overrides, docker_compose_entrypoint, run_report_in_subprocess
+from notebooker.settings import WebappConfig
 
 
 @pytest.mark.parametrize(
@@ -55,3 +57,21 @@ def test_docker_compose_entrypoint_propagates_exit_code():
         assert docker_compose_entrypoint() == 0
     with patch("notebooker.execute_notebook.sys.argv", ["", "--invalid-arg"]):
         assert docker_compose_entrypoint() != 0
+
+
+def test_run_report_in_subprocess_uses_an_existing_stub():
+    config = WebappConfig(SERIALIZER_CLS=DEFAULT_SERIALIZER, SERIALIZER_CONFIG={})
+    with patch("notebooker.execute_notebook.save_submitted_report_stub") as save_stub, patch(
+        "notebooker.execute_notebook.initialize_serializer_from_config"
+    ) as serializer, patch("notebooker.execute_notebook.subprocess.Popen") as popen, patch(
+        "notebooker.execute_notebook.threading.Thread"
+    ), patch(
+        "notebooker.execute_notebook.time.sleep"
+    ):
+        serializer().serializer_args_to_cmdline_args.return_value = []
+        popen().returncode = 0
+        job_id = run_report_in_subprocess(config, "report", "title", "", "", {}, job_id="existing_job_id")
+    assert job_id == "existing_job_id"
+    save_stub.assert_not_called()
+    serializer().save_check_stub.assert_not_called()
+    assert "existing_job_id" in popen.call_args[0][0]
@@ -104,3 +104,13 @@ def test_handle_overrides_handles_imports_with_issues(input_txt):
         "the notebook with it! "
         "(Error: {})".format(error_string)
     ]
+
+
+def test_handle_overrides_only_reports_unserialisable_parameters():
+    with mock.patch("notebooker.web.handle_overrides.subprocess.check_output") as popen:
+        popen.side_effect = lambda args: mock.MagicMock(res=_handle_overrides_safe(args[4], args[6]))
+        issues = []
+        overrides = handle_overrides("import datetime\nd = datetime.datetime(2018, 1, 1)\na = 1\nb = 'x'", issues)
+    assert overrides == {}
+    assert len(issues) == 1
+    assert issues[0].startswith('Could not JSON serialise a parameter ("d")')
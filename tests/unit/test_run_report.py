@@ -1,14 +1,42 @@
+import json
+import os
+import shutil
 import subprocess
 import sys
+import tempfile
+import time
 
+import git
 import mock
+import nbformat
+import pytest
+from flask import Flask
 from werkzeug.datastructures import CombinedMultiDict, ImmutableMultiDict
 
-from notebooker.constants import DEFAULT_SERIALIZER
-from notebooker.web.routes.report_execution import validate_run_params, RunReportParams
+from notebooker.constants import DEFAULT_SERIALIZER, JobStatus
+from notebooker.settings import WebappConfig
+from notebooker.utils import conversion
+from notebooker.web.routes import report_execution
+from notebooker.web.routes.report_execution import (
+    validate_run_params,
+    RunReportParams,
+    _extract_parameters_html,
+    _job_id_response,
+    _run_report_in_background,
+)
+from notebooker.web.app import create_app
 from notebooker.execute_notebook import _monitor_stderr
 
 
+@pytest.fixture
+def app_without_scheduler():
+    webapp_config = WebappConfig(SERIALIZER_CLS=DEFAULT_SERIALIZER, SERIALIZER_CONFIG={}, DISABLE_SCHEDULER=True)
+    flask_app = create_app(webapp_config)
+    flask_app.config.from_object(webapp_config)
+    flask_app.config["TESTING"] = True
+    return flask_app
+
+
 def test_monitor_stderr():
     dummy_process = """
 import time, sys
@@ -71,3 +99,102 @@ def test_validate_run_params():
     actual_output = validate_run_params("lovely_report_name", input_params, issues)
     assert issues == []
     assert actual_output == expected_output
+
+
+def test_extract_parameters_html():
+    nb = nbformat.v4.new_notebook(
+        cells=[
+            nbformat.v4.new_code_cell("import datetime"),
+            nbformat.v4.new_code_cell("n_points = 5\n", metadata={"tags": ["parameters"]}),
+        ]
+    )
+    assert _extract_parameters_html(nb) == "n_points = 5"
+    assert _extract_parameters_html(nbformat.v4.new_notebook(cells=nb["cells"][:1])) == ""
+
+
+@pytest.mark.parametrize("job_id", ["0b9f1c6e-6d0a-4d5e-9a3b-2f6c8e1d4a7b", 'not-a-"uuid"'])
+def test_job_id_response(job_id):
+    with Flask(__name__).app_context():
+        response = _job_id_response(job_id)
+    assert response.mimetype == "application/json"
+    assert json.loads(response.get_data()) == {"id": job_id}
+
+
+def _commit_template(repo: git.Repo, source: str):
+    with open(os.path.join(repo.working_dir, "test_report.py"), "w") as f:
+        f.write(source)
+    repo.index.add(["test_report.py"])
+    repo.index.commit("Update test_report", author=git.Actor("test", "test@example.com"))
+    repo.remotes.origin.push(repo.active_branch.name)
+
+
+def test_get_report_as_nb_picks_up_remote_template_changes():
+    workspace = tempfile.mkdtemp()
+    conversion._git_sha_cache.clear()
+    report_execution._load_nb_cached.cache_clear()
+    try:
+        remote = git.Repo.init(os.path.join(workspace, "remote.git"), bare=True)
+        upstream = remote.clone(os.path.join(workspace, "upstream"))
+        _commit_template(upstream, '# + {"tags": ["parameters"]}\nn_points = 5\n')
+        templates = remote.clone(os.path.join(workspace, "templates"))
+
+        app = Flask(__name__)
+        app.config.from_object(
+            WebappConfig(TEMPLATE_DIR=os.path.join(workspace, "converted"), PY_TEMPLATE_BASE_DIR=templates.working_dir)
+        )
+        with app.app_context():
+            assert _extract_parameters_html(report_execution.get_report_as_nb("test_report")) == "n_points = 5"
+
+            _commit_template(upstream, '# + {"tags": ["parameters"]}\nn_points = 10\n')
+            later = time.monotonic() + conversion.GIT_SHA_CACHE_SECONDS
+            with mock.patch("notebooker.utils.conversion.time.monotonic", return_value=later):
+                assert _extract_parameters_html(report_execution.get_report_as_nb("test_report")) == "n_points = 10"
+    finally:
+        conversion._git_sha_cache.clear()
+        report_execution._load_nb_cached.cache_clear()
+        shutil.rmtree(workspace)
+
+
+def test_run_report_in_background_marks_failures_as_errors():
+    config = WebappConfig(SERIALIZER_CLS=DEFAULT_SERIALIZER, SERIALIZER_CONFIG={})
+    with mock.patch(
+        "notebooker.web.routes.report_execution.run_report_in_subprocess",
+        side_effect=RuntimeError("The report execution failed with exit code 1"),
+    ) as run_report, mock.patch(
+        "notebooker.web.routes.report_execution.initialize_serializer_from_config"
+    ) as serializer:
+        with pytest.raises(RuntimeError):
+            _run_report_in_background(config, "job_id", report_name="report")
+    run_report.assert_called_once_with(base_config=config, job_id="job_id", report_name="report")
+    serializer.assert_called_once_with(config)
+    serializer().update_check_status.assert_called_once_with(
+        "job_id",
+        JobStatus.ERROR,
+        error_info="The job failed to initialise. Error: The report execution failed with exit code 1",
+    )
+
+
+@pytest.mark.parametrize("wait_for_start, expected_status", [(False, 202), (True, 500)])
+def test_run_report_json_failing_to_start(app_without_scheduler, wait_for_start, expected_status):
+    with mock.patch(
+        "notebooker.web.routes.report_execution.save_submitted_report_stub", return_value="fake_job_id"
+    ), mock.patch(
+        "notebooker.web.routes.report_execution.run_report_in_subprocess",
+        side_effect=RuntimeError("The report execution failed with exit code 1"),
+    ), mock.patch(
+        "notebooker.web.routes.report_execution.initialize_serializer_from_config"
+    ) as serializer:
+        with app_without_scheduler.test_client() as client:
+            rv = client.post("/run_report_json/fake/report", query_string={"wait_for_start": wait_for_start})
+            app_without_scheduler.extensions["notebooker_report_executor"].shutdown(wait=True)
+    assert rv.status_code == expected_status, rv.data
+    serializer().update_check_status.assert_called_once_with("fake_job_id", JobStatus.ERROR, error_info=mock.ANY)
+
+
+def test_run_report_get_preview_css_is_not_found(app_without_scheduler):
+    with mock.patch("notebooker.web.routes.report_execution._get_preview") as get_preview:
+        with app_without_scheduler.test_client() as client:
+            rv = client.get("/run_report/get_preview/foo/custom.css")
+    assert rv.status_code == 404
+    assert rv.data == b""
+    get_preview.assert_not_called()
@@ -2,13 +2,15 @@ import json
 import os
 import shutil
 import tempfile
+import time
 import uuid
 
 import pytest
 import mock
+import nbformat
 from click.testing import CliRunner
 
-from notebooker import convert_to_py
+from notebooker import constants, convert_to_py
 from notebooker.utils import conversion
 from notebooker.utils.caching import set_cache
 from notebooker.utils.conversion import _output_ipynb_name
@@ -63,3 +65,82 @@ def test_generate_py_from_ipynb():
     finally:
         shutil.rmtree(ipynb_dir)
         shutil.rmtree(py_dir)
+
+
+def test_get_template_version_without_git():
+    py_template_dir = tempfile.mkdtemp()
+    try:
+        template_path = os.path.join(py_template_dir, "test_report.py")
+        with open(template_path, "w") as f:
+            f.write("#hello world\n")
+        os.utime(template_path, ns=(1, 1))
+        first_version = conversion.get_template_version("test_report", True, py_template_dir)
+        assert conversion.get_template_version("test_report", True, py_template_dir) == first_version
+
+        os.utime(template_path, ns=(2, 2))
+        assert conversion.get_template_version("test_report", True, py_template_dir) != first_version
+
+        with pytest.raises(FileNotFoundError):
+            conversion.get_template_version("missing_report", True, py_template_dir)
+    finally:
+        shutil.rmtree(py_template_dir)
+
+
+def test_get_template_version_with_git_is_cached():
+    conversion._git_sha_cache.clear()
+    with mock.patch("notebooker.utils.conversion.git.repo.Repo") as repo:
+        repo().commit().hexsha = "fake_sha_early"
+        assert conversion.get_template_version("test_report", False, "/fake/templates") == "fake_sha_early"
+        repo().commit().hexsha = "fake_sha_later"
+        assert conversion.get_template_version("test_report", False, "/fake/templates") == "fake_sha_early"
+        repo().git.fetch.assert_called_once()
+        with mock.patch("notebooker.utils.conversion.time.monotonic", return_value=time.monotonic() + 60):
+            assert conversion.get_template_version("test_report", False, "/fake/templates") == "fake_sha_later"
+        assert repo().git.fetch.call_count == 2
+    conversion._git_sha_cache.clear()
+
+
+def test_generate_notebook_node_from_py():
+    py_template_dir = tempfile.mkdtemp()
+    template_base_dir = tempfile.mkdtemp()
+    try:
+        with open(os.path.join(py_template_dir, "test_report.py"), "w") as f:
+            f.write('# + {"tags": ["parameters"]}\nn_points = 5\n')
+        with mock.patch("notebooker.utils.conversion._get_output_path_hex", return_value="fake_sha"):
+            with mock.patch("notebooker.utils.conversion.open", wraps=open, create=True) as opened:
+                converted_nb = conversion.generate_notebook_node_from_py(
+                    template_base_dir, "test_report", False, py_template_dir
+                )
+                ipynb_path = opened.call_args[0][0]
+                assert ipynb_path.endswith(".ipynb")
+                assert mock.call(ipynb_path, "rb") not in opened.call_args_list
+                opened.reset_mock()
+                read_nb = conversion.generate_notebook_node_from_py(
+                    template_base_dir, "test_report", False, py_template_dir
+                )
+                opened.assert_called_once_with(ipynb_path, "rb")
+        assert converted_nb == read_nb
+        assert converted_nb["cells"][0]["source"] == "n_points = 5"
+        assert converted_nb["metadata"]["kernelspec"] == constants.kernel_spec()
+    finally:
+        shutil.rmtree(py_template_dir)
+        shutil.rmtree(template_base_dir)
+
+
+@pytest.mark.parametrize("as_bytes", [True, False])
+def test_notebook_node_from_json_matches_nbformat(as_bytes):
+    nb = nbformat.v4.new_notebook(
+        cells=[nbformat.v4.new_markdown_cell("# Title"), nbformat.v4.new_code_cell("a = 1\nb = 2")]
+    )
+    raw = nbformat.writes(nb)
+    parsed = conversion._notebook_node_from_json(raw.encode() if as_bytes else raw)
+    assert parsed == nbformat.reads(raw, as_version=nbformat.v4.nbformat)
+
+
+def test_notebook_node_from_json_upgrades_old_notebooks():
+    nb = nbformat.v3.new_notebook(
+        worksheets=[nbformat.v3.new_worksheet(cells=[nbformat.v3.new_code_cell(input="a = 1\nb = 2")])]
+    )
+    parsed = conversion._notebook_node_from_json(nbformat.writes(nb, version=3))
+    assert parsed.nbformat == nbformat.v4.nbformat
+    assert [(cell.cell_type, cell.source) for cell in parsed.cells] == [("code", "a = 1\nb = 2")]
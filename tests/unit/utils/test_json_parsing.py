@@ -0,0 +1,38 @@
+import math
+
+import mock
+import pytest
+
+from notebooker.utils import json_parsing
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize(
+    "input_json, expected",
+    [
+        ("{}", {}),
+        ('{"a": 1, "b": [1.5, "c"], "d": null}', {"a": 1, "b": [1.5, "c"], "d": None}),
+        (b'{"a": true}', {"a": True}),
+        ("123456789012345678901234567890", 123456789012345678901234567890),
+        (b'{"a": [-18446744073709551617]}', {"a": [-18446744073709551617]}),
+        ('{"a": 9007199254740993}', {"a": 9007199254740993}),
+    ],
+)
+def test_json_loads(use_orjson, input_json, expected):
+    with mock.patch.object(json_parsing, "orjson", json_parsing.orjson if use_orjson else None):
+        assert json_parsing.json_loads(input_json) == expected
+
+
+def test_json_loads_nan():
+    assert math.isnan(json_parsing.json_loads('{"a": NaN}')["a"])
+
+
+def test_json_loads_invalid():
+    with pytest.raises(ValueError):
+        json_parsing.json_loads("{")
+
+
+def test_json_loads_big_ints_are_exact():
+    value = json_parsing.json_loads('{"a": 123456789012345678901234567890}')["a"]
+    assert isinstance(value, int)
+    assert value == 123456789012345678901234567890
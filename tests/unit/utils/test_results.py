@@ -129,3 +129,23 @@ def test_get_latest_successful_job_results_all_params(_get_job_results):
     )
     assert len(all_results) == 1
     assert all_results[0] == sentinel.results
+
+
+def test_invalidate_result_keys_for_job():
+    all_keys = [("report_a", "job_1"), ("report_b", "job_2"), ("report_a", "job_3")]
+    with patch("notebooker.utils.results.get_cache", return_value=all_keys) as get_cache, patch(
+        "notebooker.utils.results.set_cache"
+    ) as set_cache:
+        results.invalidate_result_keys_for_job("job_2", limit=sentinel.limit)
+    get_cache.assert_called_once_with(("all_result_keys", sentinel.limit))
+    set_cache.assert_called_once_with(
+        ("all_result_keys", sentinel.limit), [("report_a", "job_1"), ("report_a", "job_3")], timeout=1
+    )
+
+
+def test_invalidate_result_keys_for_job_nothing_cached():
+    with patch("notebooker.utils.results.get_cache", return_value=None), patch(
+        "notebooker.utils.results.set_cache"
+    ) as set_cache:
+        results.invalidate_result_keys_for_job("job_2")
+    set_cache.assert_not_called()
@@ -3,8 +3,12 @@ import pytest
 import shutil
 import tempfile
 
+import mock
+from flask import Flask
+
 from notebooker.utils.filesystem import mkdir_p
 from notebooker.utils.templates import _valid_dirname
+from notebooker.web import utils
 from notebooker.web.utils import get_directory_structure
 
 
@@ -64,3 +68,24 @@ def test_get_directory_structure():
         assert get_directory_structure(temp_dir) == expected_structure
     finally:
         shutil.rmtree(temp_dir)
+
+
+def test_get_all_possible_templates_is_cached():
+    temp_dir = tempfile.mkdtemp()
+    app = Flask(__name__)
+    app.config.update(PY_TEMPLATE_BASE_DIR=temp_dir, PY_TEMPLATE_SUBDIR="")
+    utils._template_listing_cache.clear()
+    try:
+        with open(os.path.join(temp_dir, "hello.py"), "w") as f:
+            f.write("#hello")
+        with app.app_context():
+            assert utils.get_all_possible_templates() == {"hello": None}
+            with open(os.path.join(temp_dir, "goodbye.py"), "w") as f:
+                f.write("#goodbye")
+            assert utils.get_all_possible_templates() == {"hello": None}
+            later = utils.time.monotonic() + utils.TEMPLATE_LISTING_CACHE_SECONDS
+            with mock.patch("notebooker.web.utils.time.monotonic", return_value=later):
+                assert utils.get_all_possible_templates() == {"hello": None, "goodbye": None}
+    finally:
+        utils._template_listing_cache.clear()
+        shutil.rmtree(temp_dir)
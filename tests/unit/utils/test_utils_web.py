@@ -81,3 +81,14 @@ def test_json_to_python(input_json, output_python):
         assert json_to_python(input_json) is None
     else:
         assert json_to_python(input_json) == output_python
+
+
+def test_validation_issues_are_reported_on_every_call():
+    for _ in range(2):
+        issues = []
+        assert web.validate_mailto("hello @test-email.com", issues) == "hello @test-email.com"
+        assert web.validate_title('this is "great"', issues) == 'this is "great"'
+        assert issues == [
+            constants.EMAIL_SPACE_ERR_MSG,
+            'This report has an invalid input (this is "great") - it must not contain any of [\'"\'].',
+        ]